@@ -4,8 +4,16 @@
 
 import argparse
 import csv
+import io
 import logging
-from typing import Callable, Iterable, Optional, Sequence, TextIO
+import operator
+import os
+import shutil
+import stat
+import sys
+from collections import deque
+from itertools import chain, islice
+from typing import Any, Callable, Collection, Iterable, Iterator, Mapping, Optional, Sequence, TextIO, TypeVar
 
 
 # global constants
@@ -16,12 +24,34 @@ DIALECT_ATTRS = [
     "quotechar",
     "escapechar",
 ]
+# all the attributes that affect how a Dialect reads or writes
+DIALECT_FORMAT_ATTRS = [
+    "delimiter",
+    "doublequote",
+    "escapechar",
+    "lineterminator",
+    "quotechar",
+    "quoting",
+    "skipinitialspace",
+]
 # FIXME not using csv.get_dialect() because type mismatch csv.Dialect vs csv._Dialect vs. _csv.Dialect !?
 DIALECT_NAMES: dict[str, Callable[[], csv.Dialect]] = {
     "excel": csv.excel,
     "excel_tab": csv.excel_tab,
     "unix": csv.unix_dialect,
 }
+# values of the csv.QUOTE_* constants, some are only in recent Python versions
+QUOTING_VALUES = sorted(getattr(csv, name) for name in dir(csv) if name.startswith("QUOTE_"))
+DEFAULT_ENCODING = "utf-8"
+READ_BUFFER_SIZE = 1 << 20  # bytes
+WRITE_BUFFER_SIZE = 1 << 20  # bytes
+COPY_BUFFER_SIZE = 1 << 20  # characters
+WRITE_BATCH_ROWS = 4096
+PARALLEL_BATCH_ROWS = 65536
+PARALLEL_MIN_SIZE = 8 << 20  # bytes, smaller files are not worth starting worker processes
+
+# a CSV row, dict keyed by column-name or list indexed by column
+Row = TypeVar("Row", dict[str, str], Sequence[str])
 
 # prepare global logger
 logger = logging.getLogger(__name__)
@@ -50,22 +80,27 @@ def read_dialect(
     quotechar: Optional[str] = None,
     escapechar: Optional[str] = None
 ) -> csv.Dialect:
-    """Modify dialect with given parameters"""
+    """Modify dialect with given parameters, those left to ``None`` are not modified"""
 
     logger.debug("starting dialect: %s", dialect)
-    if delimiter:
+    if delimiter is not None:
         dialect.delimiter = delimiter
-    if quoting:
+    if quoting is not None:
         dialect.quoting = quoting
-    if quotechar:
+    if quotechar is not None:
         dialect.quotechar = quotechar
-    if escapechar:
+    if escapechar is not None:
         dialect.escapechar = escapechar
 
     logger.debug("returning dialect: %s", dialect)
     return dialect
 
 
+def same_dialect(dialect_a: csv.Dialect, dialect_b: csv.Dialect) -> bool:
+    """Whether both dialects read and write CSV the same way."""
+    return all(getattr(dialect_a, attr) == getattr(dialect_b, attr) for attr in DIALECT_FORMAT_ATTRS)
+
+
 def log_dialect(log_level: int, dialect: csv.Dialect) -> None:
     logger.log(log_level, "Dialect:")
     for attr in DIALECT_ATTRS:  # FIXME add more fields
@@ -77,16 +112,33 @@ def log_dialect(log_level: int, dialect: csv.Dialect) -> None:
 
 def filter_prolog(input_file: TextIO, keep_prolog: int, skip_prolog: int) -> list[str]:
     """Filter the first lines in the file."""
-    prolog_lines = []
     num_prolog_lines = max(keep_prolog, skip_prolog)
-    for i in range(1, num_prolog_lines + 1):
-        line = input_file.readline()
-        if keep_prolog:
-            logger.debug("keeping prolog line %d / %d : %r", i, num_prolog_lines, line)
-            prolog_lines.append(line)
-        elif skip_prolog:
-            logger.debug("skipping prolog line %d / %d : %r", i, num_prolog_lines, line)
-    return prolog_lines
+    input_lines = islice(input_file, num_prolog_lines)
+
+    # log each line, only worth the loop in debug
+    if logger.isEnabledFor(logging.DEBUG):
+        prolog_lines = []
+        action = "keeping" if keep_prolog else "skipping"
+        for i, line in enumerate(input_lines, start=1):
+            logger.debug("%s prolog line %d / %d : %r", action, i, num_prolog_lines, line)
+            if keep_prolog:
+                prolog_lines.append(line)
+        return prolog_lines
+
+    if keep_prolog:
+        return list(input_lines)
+    deque(input_lines, maxlen=0)  # consume without storing the skipped lines
+    return []
+
+
+def copy_prolog(input_file: TextIO, output_file: TextIO, keep_prolog: int, skip_prolog: int) -> None:
+    """Filter the first lines in the file like ``filter_prolog()``, write the kept lines to ``output_file``.
+    Lines are written as they are read, without an intermediate list, unless they are logged in debug.
+    """
+    if keep_prolog and not logger.isEnabledFor(logging.DEBUG):
+        output_file.writelines(islice(input_file, max(keep_prolog, skip_prolog)))
+    else:
+        output_file.writelines(filter_prolog(input_file, keep_prolog, skip_prolog))
 
 
 # column-filtering
@@ -98,22 +150,27 @@ def read_cols(input_cols: Sequence[str], keep_cols: list[str], skip_cols: list[s
     If `keep_cols` is not empty, `skip_cols` is not used.
     """
 
+    # sets for constant-time membership tests on wide files
+    input_set = frozenset(input_cols)
+    keep_set = frozenset(keep_cols)
+    skip_set = frozenset(skip_cols)
+
     # preconditions
     for i, c in enumerate(keep_cols):
-        if c not in input_cols:
+        if c not in input_set:
             logger.error("keep_cols index %d : %r not in input_cols!", i, c)
             raise KeyError
     for i, c in enumerate(skip_cols):
-        if c not in input_cols:
+        if c not in input_set:
             logger.error("skip_cols index %d : %r not in input_cols!", i, c)
             raise KeyError
 
     # keep `input_cols`` found in `keep_cols`` and not in `skip_cols``
     kept_cols = list(input_cols)
     if keep_cols:
-        kept_cols = [c for c in kept_cols if c in keep_cols]
+        kept_cols = [c for c in kept_cols if c in keep_set]
     if skip_cols:
-        kept_cols = [c for c in kept_cols if c not in skip_cols]
+        kept_cols = [c for c in kept_cols if c not in skip_set]
     return kept_cols
 
 
@@ -125,16 +182,42 @@ def filter_cols(row: dict[str, str], keep_cols: list[str]) -> dict[str, str]:
     return row
 
 
+def project_cols(keep_idx: list[int]) -> Callable[[list[str]], Sequence[str]]:
+    """Return a function picking the values at ``keep_idx`` from a row, in that order.
+    Built on ``operator.itemgetter``, which always returns a tuple here, even for zero or one index.
+    """
+    if not keep_idx:
+        return lambda row: ()
+    if len(keep_idx) == 1:
+        (i,) = keep_idx
+        return lambda row: (row[i],)
+    return operator.itemgetter(*keep_idx)
+
+
+def index_cols(input_cols: Sequence[str]) -> dict[str, int]:
+    """Map each column-name in ``input_cols`` to its last index, the value ``csv.DictReader`` keeps for repeats."""
+    return {c: i for i, c in enumerate(input_cols)}
+
+
+def read_col_indices(input_cols: Sequence[str], kept_cols: list[str]) -> list[int]:
+    """List the indices in ``input_cols`` of the columns in ``kept_cols``, resolved once for the whole file.
+    Columns are matched by position, ``kept_cols`` is in input order as from ``read_cols()``, so repeated names each
+    keep their own value.
+    """
+    kept_set = frozenset(kept_cols)
+    return [i for i, c in enumerate(input_cols) if c in kept_set]
+
+
 # row-filtering
 
 
 # FIXME make this a type= for ArgumentParser?
-def read_row_filters(row_args: list[list[str]]) -> dict[str, list[str]]:
-    """Parse row-filter command-line parameters."""
-    return {r[0]: r[1:] for r in row_args}
+def read_row_filters(row_args: list[list[str]]) -> dict[str, frozenset[str]]:
+    """Parse row-filter command-line parameters, values are kept as sets for constant-time membership tests."""
+    return {r[0]: frozenset(r[1:]) for r in row_args}
 
 
-def keep_row(row, keep_rows: dict[str, list[str]]) -> bool:
+def keep_row(row, keep_rows: dict[str, Collection[str]]) -> bool:
     """Whether to keep a row based on the row-filters for rows to keep."""
     if keep_rows:
         for col, values in keep_rows.items():
@@ -143,7 +226,7 @@ def keep_row(row, keep_rows: dict[str, list[str]]) -> bool:
     return True
 
 
-def skip_row(row, skip_rows: dict[str, list[str]]) -> bool:
+def skip_row(row, skip_rows: dict[str, Collection[str]]) -> bool:
     """Whether to keep a row based on the row-filters for rows to skip."""
     if skip_rows:
         for col, values in skip_rows.items():
@@ -152,16 +235,182 @@ def skip_row(row, skip_rows: dict[str, list[str]]) -> bool:
     return True
 
 
-def filter_rows(input_rows: Iterable[dict[str, str]], keep_rows: dict[str, list[str]], skip_rows: dict[str, list[str]]):
-    """Keep rows that match the row-filters."""
-    for row in input_rows:
-        if keep_row(row, keep_rows) and skip_row(row, skip_rows):
-            yield row
+def compile_row_filter(
+    keep_rows: Mapping[Any, frozenset[str]],
+    skip_rows: Mapping[Any, frozenset[str]],
+) -> Callable[[Any], bool]:
+    """Generate a function testing a row against all the row-filters in one expression, like:
+    ``lambda row: row[3] in keep_0 and row[7] not in skip_0``.
+    Filter keys are column-names or indices, they are inlined in the generated source with ``repr()``.
+    """
+    tests = [f"row[{c!r}] in _keep_{n}" for n, c in enumerate(keep_rows)]
+    tests += [f"row[{c!r}] not in _skip_{n}" for n, c in enumerate(skip_rows)]
+    values = {f"_keep_{n}": v for n, v in enumerate(keep_rows.values())}
+    values.update({f"_skip_{n}": v for n, v in enumerate(skip_rows.values())})
+
+    # filter values are bound as default arguments so they are local variables in the generated function
+    params = "".join(f", {name}={name}" for name in values)
+    source = f"def row_filter(row{params}):\n    return {' and '.join(tests) or 'True'}\n"
+    logger.debug("compiled row-filter: %r", source)
+    namespace = dict(values)
+    exec(source, namespace)
+    return namespace["row_filter"]
+
+
+def filter_rows(
+    input_rows: Iterable[Row],
+    keep_rows: Mapping[Any, frozenset[str]],
+    skip_rows: Mapping[Any, frozenset[str]],
+) -> Iterator[Row]:
+    """Keep rows that match the row-filters.
+    Rows are dicts filtered by column-name, or lists filtered by column-index as from ``read_row_indices()``.
+    Same as ``keep_row() and skip_row()`` but with the filters compiled once by ``compile_row_filter()``.
+    """
+    if not (keep_rows or skip_rows):
+        return iter(input_rows)
+    return filter(compile_row_filter(keep_rows, skip_rows), input_rows)
+
+
+def read_row_indices(input_cols: Sequence[str], row_filters: dict[str, frozenset[str]]) -> dict[int, frozenset[str]]:
+    """Key the row-filters by column index in ``input_cols`` instead of by column-name."""
+    col_idx = index_cols(input_cols)
+    for c in row_filters:
+        if c not in col_idx:
+            logger.error("row-filter column %r not in input_cols!", c)
+            raise KeyError(c)
+    return {col_idx[c]: frozenset(values) for c, values in row_filters.items()}
 
 
 # csv-processing
 
 
+def is_unquoted(dialect: csv.Dialect) -> bool:
+    """Whether ``dialect`` writes rows as plain ``delimiter.join(row) + lineterminator``."""
+    return dialect.quoting == csv.QUOTE_NONE and dialect.escapechar is None
+
+
+def write_rows(output_file: TextIO, output_dialect: csv.Dialect, rows: Iterable[Sequence[str]]) -> None:
+    """Write ``rows`` to ``output_file`` in ``output_dialect``.
+    For an unquoted dialect, see ``is_unquoted()``, rows are joined as strings in batches of ``WRITE_BATCH_ROWS``
+    and each batch is written at once. A batch with a value ``csv.writer`` would reject is handed to it instead,
+    so the same ``csv.Error`` is raised.
+    """
+    csv_writer = csv.writer(output_file, dialect=output_dialect)
+    if not is_unquoted(output_dialect):
+        csv_writer.writerows(rows)
+        return
+
+    delimiter = output_dialect.delimiter
+    lineterminator = output_dialect.lineterminator
+    special_chars = {delimiter, "\r", "\n", *lineterminator}
+    if output_dialect.quotechar:
+        special_chars.add(output_dialect.quotechar)
+    join_row = delimiter.join
+    input_rows = iter(rows)
+    for batch in iter(lambda: list(islice(input_rows, WRITE_BATCH_ROWS)), []):
+        batch_text = "".join(chain.from_iterable(batch))
+        if any(c in batch_text for c in special_chars) or [""] in batch or ("",) in batch:
+            csv_writer.writerows(batch)  # needs escaping or quoting
+        else:
+            output_file.write(lineterminator.join(map(join_row, batch)) + lineterminator)
+
+
+def fit_rows(input_rows: Iterable[list[str]], num_cols: int) -> Iterator[list[str]]:
+    """Drop blank records and fit the other rows to ``num_cols`` values, like ``csv.DictReader`` did.
+    Short rows are padded with empty values, extra values are dropped.
+    This is the one step of ``process_rows()`` in Python code, the generator resumes once per row. Padding every row
+    in C with ``map(operator.add, rows, repeat(padding))`` was measured slower, it copies each row.
+    """
+    for row in input_rows:
+        if len(row) != num_cols:
+            if not row:
+                continue
+            row = (row + [""] * num_cols)[:num_cols]
+        yield row
+
+
+def process_rows(
+    csv_reader: Iterable[list[str]],
+    output_file: TextIO,
+    output_dialect: csv.Dialect,
+    num_cols: int,
+    keep_idx: list[int],
+    keep_rows: dict[int, frozenset[str]],
+    skip_rows: dict[int, frozenset[str]],
+) -> None:
+    """Filter and project the rows from ``csv_reader``, write them to ``output_file``.
+    This is the whole per-row loop, filtering, projecting and writing are done in bulk inside C code, only
+    ``fit_rows()`` runs Python code for each row.
+    """
+    # lazy pipeline: read -> filter -> project -> write, consumed by `write_rows()`
+    rows = filter_rows(fit_rows(csv_reader, num_cols), keep_rows, skip_rows)
+    if keep_idx != list(range(num_cols)):  # otherwise all columns kept in order, rows are written as read
+        rows = map(project_cols(keep_idx), rows)
+    write_rows(output_file, output_dialect, rows)
+
+
+def can_process_parallel(input_file: TextIO, input_dialect: csv.Dialect) -> bool:
+    """Whether the rows of ``input_file`` can be split into batches of lines for ``process_rows_parallel()``.
+    Only with an unquoted input dialect, see ``is_unquoted()``, where a value cannot hold a line break.
+    """
+    if not is_unquoted(input_dialect):
+        logger.info("input dialect is quoted, processing in a single process")
+        return False
+    try:
+        file_stat = os.fstat(input_file.fileno())
+    except (OSError, ValueError):
+        return True  # not a real file, size unknown
+    if stat.S_ISREG(file_stat.st_mode) and file_stat.st_size < PARALLEL_MIN_SIZE:
+        logger.info("input file smaller than %d bytes, processing in a single process", PARALLEL_MIN_SIZE)
+        return False
+    return True
+
+
+# arguments of `process_rows()` in each worker process, set by `_init_worker()`
+_worker_args: tuple = ()
+
+
+def _init_worker(*args) -> None:
+    global _worker_args
+    _worker_args = args
+
+
+def _process_batch(lines: list[str]) -> str:
+    """Process a batch of input lines with `process_rows()` in a worker process, return the output text."""
+    input_dialect, output_dialect, *process_args = _worker_args
+    output_file = io.StringIO(newline="")
+    process_rows(csv.reader(lines, dialect=input_dialect), output_file, output_dialect, *process_args)
+    return output_file.getvalue()
+
+
+def process_rows_parallel(
+    input_file: TextIO,
+    output_file: TextIO,
+    input_dialect: csv.Dialect,
+    output_dialect: csv.Dialect,
+    workers: int,
+    num_cols: int,
+    keep_idx: list[int],
+    keep_rows: dict[int, frozenset[str]],
+    skip_rows: dict[int, frozenset[str]],
+) -> None:
+    """Same as ``process_rows()`` for the lines left in ``input_file``, in ``workers`` processes.
+    Lines are sent to the workers in numbered batches of ``PARALLEL_BATCH_ROWS``, the output of each batch is written
+    in input order. At most ``2 * workers`` batches are in flight, so memory does not grow with the file.
+    """
+    from concurrent.futures import ProcessPoolExecutor  # ~10 ms of multiprocessing imports, only paid when used
+
+    init_args = (input_dialect, output_dialect, num_cols, keep_idx, keep_rows, skip_rows)
+    pending = deque()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as executor:
+        for batch in iter(lambda: list(islice(input_file, PARALLEL_BATCH_ROWS)), []):
+            pending.append(executor.submit(_process_batch, batch))
+            if len(pending) >= 2 * workers:
+                output_file.write(pending.popleft().result())
+        while pending:
+            output_file.write(pending.popleft().result())
+
+
 def process_csv(
     # files
     input_file: TextIO,
@@ -175,41 +424,55 @@ def process_csv(
     # filter
     keep_cols: list[str],
     skip_cols: list[str],
-    keep_rows: dict[str, list[str]],
-    skip_rows: dict[str, list[str]],
+    keep_rows: dict[str, frozenset[str]],
+    skip_rows: dict[str, frozenset[str]],
+    # processing
+    workers: int = 1,
 ) -> None:
-    """Process CSV from ``input_file``, write to ``output_file``."""
+    """Process CSV from ``input_file``, write to ``output_file``.
+    With more than one of ``workers``, rows are processed in that many processes when possible.
+    """
 
     # prepare to read from to input-file
     logger.debug("reading from file: %s", input_file.name)
 
-    # filter prolog-lines
-    prolog_lines = filter_prolog(input_file, keep_prolog, skip_prolog)
+    # filter prolog-lines, write those that were kept
+    logger.debug("writing to file: %s", output_file.name)
+    copy_prolog(input_file, output_file, keep_prolog, skip_prolog)
+
+    # nothing to filter or convert, copy the rest of the file as-is
+    if not (keep_cols or skip_cols or keep_rows or skip_rows) and same_dialect(input_dialect, output_dialect):
+        logger.debug("no filter and same dialect, copying input to output")
+        shutil.copyfileobj(input_file, output_file, COPY_BUFFER_SIZE)
+        return
 
     logger.debug("input csv dialect: %s", input_dialect)
-    csv_reader = csv.DictReader(input_file, dialect=input_dialect)
-    csv_fields = csv_reader.fieldnames
-    if csv_fields is None:
-        csv_fields = []
+    csv_reader = csv.reader(input_file, dialect=input_dialect)
+    csv_fields = next(csv_reader, [])
 
     # which fields to keep
     kept_cols = read_cols(csv_fields, keep_cols, skip_cols)
     logger.debug("keeping columns: %s", kept_cols)
 
-    # prepare to write to output-file
-    logger.debug("writing to file: %s", output_file.name)
-    csv_writer = csv.DictWriter(output_file, kept_cols)
+    # resolve column-names to indices once, rows are lists from here on
+    keep_idx = read_col_indices(csv_fields, kept_cols)
+    keep_rows_idx = read_row_indices(csv_fields, keep_rows)
+    skip_rows_idx = read_row_indices(csv_fields, skip_rows)
 
-    # write prolog lines that were kept
-    for i, line in enumerate(prolog_lines, start=1):
-        logger.debug("writing prolog line %d / %d : %r", i, len(prolog_lines), line)
-        output_file.write(line)
+    # prepare to write to output-file
+    logger.debug("output csv dialect: %s", output_dialect)
+    csv_writer = csv.writer(output_file, dialect=output_dialect)
 
     # write filtered rows
-    csv_writer.writeheader()
-    for row in filter_rows(csv_reader, keep_rows, skip_rows):
-        row = filter_cols(row, kept_cols)
-        csv_writer.writerow(row)
+    csv_writer.writerow(kept_cols)
+    if workers > 1 and can_process_parallel(input_file, input_dialect):
+        logger.debug("processing rows in %d processes", workers)
+        process_rows_parallel(
+            input_file, output_file, input_dialect, output_dialect, workers,
+            len(csv_fields), keep_idx, keep_rows_idx, skip_rows_idx,
+        )
+    else:
+        process_rows(csv_reader, output_file, output_dialect, len(csv_fields), keep_idx, keep_rows_idx, skip_rows_idx)
 
 
 # main
@@ -219,14 +482,48 @@ def dialect_arg(name: str) -> csv.Dialect:
     return init_dialect(name)  # raises ValueError, picked up by ArgumentPArser
 
 
-def parse_args():
-    """Specify command-line parameters"""
+def char_arg(value: str) -> str:
+    """Check a one-character Dialect parameter, the csv module would raise a TypeError later."""
+    if len(value) != 1:
+        raise ValueError(value)  # picked up by ArgumentParser
+    return value
+
+
+def open_input(path: str, encoding: str = DEFAULT_ENCODING) -> TextIO:
+    """Open CSV file ``path`` for reading, ``-`` is stdin.
+    Uses a large read-buffer and ``newline=""`` as required by the ``csv`` module.
+    """
+    file = sys.stdin.fileno() if path == "-" else path
+    return open(file, "rt", buffering=READ_BUFFER_SIZE, encoding=encoding, newline="", closefd=path != "-")
+
+
+def open_output(path: str, encoding: str = DEFAULT_ENCODING) -> TextIO:
+    """Open CSV file ``path`` for writing, ``-`` is stdout.
+    Uses a large write-buffer and ``newline=""`` as required by the ``csv`` module.
+    """
+    file = sys.stdout.fileno() if path == "-" else path
+    return open(file, "wt", buffering=WRITE_BUFFER_SIZE, encoding=encoding, newline="", closefd=path != "-")
+
+
+def log_level(verbose: int) -> int:
+    """Logging level for the number of ``--verbose`` flags, WARNING by default."""
+    return max(logging.WARNING - 10 * verbose, logging.DEBUG)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Specify command-line parameters, read from ``argv`` or ``sys.argv``"""
 
     # define command-line paramerters
     arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "-v", "--verbose", action="count", default=0, help="log more details, -v for INFO, -vv for DEBUG"
+    )
     file_group = arg_parser.add_argument_group("file")
-    file_group.add_argument("input_file", type=argparse.FileType("rt"), help="input CSV file")
-    file_group.add_argument("output_file", type=argparse.FileType("wt"), help="output CSV file")
+    file_group.add_argument("input_file", help="input CSV file, - for stdin")
+    file_group.add_argument("output_file", help="output CSV file, - for stdout")
+    file_group.add_argument(
+        "--encoding", default=DEFAULT_ENCODING, metavar="E", help="encoding of the input and output CSV files"
+    )
 
     # input dialect
     input_dialect_group = arg_parser.add_argument_group("input dialect")
@@ -237,10 +534,22 @@ def parse_args():
         metavar="N",
         help="name of the input Dialect",
     )
-    input_dialect_group.add_argument("--input-delimiter", metavar="D", help="delimiter for the input Dialect")
-    input_dialect_group.add_argument("--input-quoting", metavar="Q", help="quoting for the input Dialect")
-    input_dialect_group.add_argument("--input-quotechar", metavar="C", help="quotechar for the input Dialect")
-    input_dialect_group.add_argument("--input-escapechar", metavar="C", help="escapechar for the input Dialect")
+    input_dialect_group.add_argument(
+        "--input-delimiter", type=char_arg, metavar="D", help="delimiter for the input Dialect"
+    )
+    input_dialect_group.add_argument(
+        "--input-quoting",
+        type=int,
+        choices=QUOTING_VALUES,
+        metavar="Q",
+        help="quoting for the input Dialect, as a csv.QUOTE_* value",
+    )
+    input_dialect_group.add_argument(
+        "--input-quotechar", type=char_arg, metavar="C", help="quotechar for the input Dialect"
+    )
+    input_dialect_group.add_argument(
+        "--input-escapechar", type=char_arg, metavar="C", help="escapechar for the input Dialect"
+    )
 
     # output dialect
     output_dialect_group = arg_parser.add_argument_group("output dialect")
@@ -251,10 +560,22 @@ def parse_args():
         metavar="N",
         help="name of the output Dialect",
     )
-    output_dialect_group.add_argument("--output-delimiter", metavar="D", help="delimiter for the output Dialect")
-    output_dialect_group.add_argument("--output-quoting", metavar="Q", help="quoting for the output Dialect")
-    output_dialect_group.add_argument("--output-quotechar", metavar="C", help="quotechar for the output Dialect")
-    output_dialect_group.add_argument("--output-escapechar", metavar="C", help="escapechar for the output Dialect")
+    output_dialect_group.add_argument(
+        "--output-delimiter", type=char_arg, metavar="D", help="delimiter for the output Dialect"
+    )
+    output_dialect_group.add_argument(
+        "--output-quoting",
+        type=int,
+        choices=QUOTING_VALUES,
+        metavar="Q",
+        help="quoting for the output Dialect, as a csv.QUOTE_* value",
+    )
+    output_dialect_group.add_argument(
+        "--output-quotechar", type=char_arg, metavar="C", help="quotechar for the output Dialect"
+    )
+    output_dialect_group.add_argument(
+        "--output-escapechar", type=char_arg, metavar="C", help="escapechar for the output Dialect"
+    )
 
     # prolog
     prolog_group = arg_parser.add_argument_group("prolog")
@@ -271,10 +592,12 @@ def parse_args():
     # filter
     filter_group = arg_parser.add_argument_group("filter")
     filter_group.add_argument(
-        "--keep-cols", type=str, nargs="+", metavar="C", help="list of column-names to keep, in the order to be kept"
+        "--keep-cols", type=str, nargs="+", default=[], metavar="C",
+        help="list of column-names to keep, in the order to be kept"
     )
     filter_group.add_argument(
-        "--skip-cols", type=str, nargs="+", metavar="C", help="list of column-names to skip, in the order to be kept"
+        "--skip-cols", type=str, nargs="+", default=[], metavar="C",
+        help="list of column-names to skip, in the order to be kept"
     )
     filter_group.add_argument(
         "--keep-rows", type=str, nargs="+", action="append", default=[], metavar=("R", "V"),
@@ -285,8 +608,22 @@ def parse_args():
         help="column-name followed by list of skipped values"
     )
 
+    # processing
+    process_group = arg_parser.add_argument_group("processing")
+    process_group.add_argument(
+        "--workers", type=int, default=1, metavar="N",
+        help="number of processes for the rows, only used for unquoted input dialects and files of at least 8 MiB"
+    )
+
     # read command-line paramerters
-    args = arg_parser.parse_args()
+    args = arg_parser.parse_args(argv)
+
+    # open files once the encoding is known
+    try:
+        args.input_file = open_input(args.input_file, args.encoding)
+        args.output_file = open_output(args.output_file, args.encoding)
+    except (OSError, LookupError) as e:
+        arg_parser.error(str(e))
     return args
 
 
@@ -297,7 +634,7 @@ def main():
     args = parse_args()
 
     # prepare logging
-    logging.basicConfig(format="%(asctime)s %(levelname)-8s %(message)s", level=logging.NOTSET)
+    logging.basicConfig(format="%(asctime)s %(levelname)-8s %(message)s", level=log_level(args.verbose))
     logger.debug("args: %s", args)
 
     # input dialect
@@ -332,23 +669,26 @@ def main():
         logger.debug("skip_rows: %s", skip_rows)
 
     # process CSV
-    process_csv(
-        # files
-        args.input_file,
-        args.output_file,
-        # dialect
-        input_dialect,
-        output_dialect,
-        # prolog
-        args.keep_prolog,
-        args.skip_prolog,
-        # filter columns
-        args.keep_cols,
-        args.skip_cols,
-        # filter rows
-        keep_rows,
-        skip_rows,
-    )
+    with args.input_file, args.output_file:
+        process_csv(
+            # files
+            args.input_file,
+            args.output_file,
+            # dialect
+            input_dialect,
+            output_dialect,
+            # prolog
+            args.keep_prolog,
+            args.skip_prolog,
+            # filter columns
+            args.keep_cols,
+            args.skip_cols,
+            # filter rows
+            keep_rows,
+            skip_rows,
+            # processing
+            args.workers,
+        )
 
 
 if __name__ == "__main__":
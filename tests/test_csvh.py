@@ -2,9 +2,16 @@
 
 # standard imports
 import argparse
-import copy
+import contextlib
 import csv
+import io
+import logging
+import os
+import pathlib
+import tempfile
+import types
 import unittest
+from unittest import mock
 
 # local imports
 import csvh
@@ -13,34 +20,52 @@ import csvh
 class TestDialect(unittest.TestCase):
     """Test dialect functions."""
 
+    # dialect names, and the class `init_dialect()` returns for them, `None` is called without a name
+    INIT_CASES = (
+        (None, csv.excel),
+        ("excel", csv.excel),
+        ("excel_tab", csv.excel_tab),
+        ("unix", csv.unix_dialect),
+    )
+
     def test_init_dialect(self):
         """Test `init_dialect()`."""
-        self.assertIsInstance(csvh.init_dialect(), csv.excel)
-        self.assertIsInstance(csvh.init_dialect("excel"), csv.excel)
-        self.assertIsInstance(csvh.init_dialect("excel_tab"), csv.excel_tab)
-        self.assertIsInstance(csvh.init_dialect("unix"), csv.unix_dialect)
+        for name, dialect_class in self.INIT_CASES:
+            with self.subTest(name=name):
+                dialect = csvh.init_dialect() if name is None else csvh.init_dialect(name)
+                self.assertIsInstance(dialect, dialect_class)
         with self.assertRaises(ValueError):
             _ = csvh.init_dialect("BOGUS")
 
+    # attributes of the base Dialect, read from the class
+    BASE_VARS = {
+        attr: getattr(csv.excel, attr)
+        for attr in ("delimiter", "quotechar", "escapechar", "lineterminator", "skipinitialspace", "quoting")
+    }
+
     def test_read_dialect(self):
         """Test `read_dialect()`."""
+        dialect_test = csvh.read_dialect(csv.excel(), delimiter="\t", quoting=csv.QUOTE_NONE)
+
+        # test only the given fields are modified
+        test_vars = {attr: getattr(dialect_test, attr) for attr in self.BASE_VARS}
+        modified_vars = {attr: value for attr, value in test_vars.items() if value != self.BASE_VARS[attr]}
+        self.assertEqual(modified_vars, {"delimiter": "\t", "quoting": csv.QUOTE_NONE})
 
-        # Dialect before and after test
-        dialect_base = csv.excel()
-        dialect_copy = copy.copy(dialect_base)
-        dialect_test = csvh.read_dialect(dialect_copy, delimiter="\t", quoting=csv.QUOTE_NONE)
+        # test the instance was modified, not the class
+        self.assertEqual({attr: getattr(csv.excel, attr) for attr in self.BASE_VARS}, self.BASE_VARS)
 
-        # test which fields are modified
-        self.assertEqual(dialect_test.delimiter, "\t")
-        self.assertNotEqual(dialect_test.delimiter, dialect_base.delimiter)
-        self.assertEqual(dialect_test.quoting, csv.QUOTE_NONE)
-        self.assertNotEqual(dialect_test.quoting, dialect_base.quoting)
+        # test falsy values are applied, not taken as missing
+        dialect_test = csvh.read_dialect(csv.unix_dialect(), quoting=csv.QUOTE_MINIMAL)
+        self.assertEqual(dialect_test.quoting, csv.QUOTE_MINIMAL)
 
-        # test which fields are unchanged
-        self.assertEqual(dialect_test.quotechar, dialect_base.quotechar)
-        self.assertEqual(dialect_test.escapechar , dialect_base.escapechar)
-        self.assertEqual(dialect_test.lineterminator, dialect_base.lineterminator)
-        self.assertEqual(dialect_test.skipinitialspace, dialect_base.skipinitialspace)
+    def test_same_dialect(self):
+        """Test `same_dialect()`."""
+        self.assertEqual(csvh.same_dialect(csv.excel, csv.excel), True)
+        self.assertEqual(csvh.same_dialect(csv.excel, csv.excel_tab), False)
+        self.assertEqual(csvh.same_dialect(csv.excel, csv.unix_dialect), False)
+        dialect_test = csvh.read_dialect(csv.excel(), delimiter="\t")
+        self.assertEqual(csvh.same_dialect(dialect_test, csv.excel_tab), True)
 
 
 class TestProlog(unittest.TestCase):
@@ -48,145 +73,343 @@ class TestProlog(unittest.TestCase):
 
     PROLOG_LINES = ["BOGUS BOGUS BOGUS\n"]
 
-    def setUp(self):
-        """Open test-files. `self._prolog_file` has the prolog, `self._test_file` has no prolog, otherwise identical."""
-        self._prolog_file = open("data/tess_01.csv", "rt")
-        self._test_file = open("data/tess_00.csv", "rt")
-
-    def tearDown(self):
-        """Close test-files."""
-        self._prolog_file.close()
-        self._test_file.close()
-
-    def test_filter_prolog_keep(self):
-        """Test `filter_prolog(keep_prolog=1)`."""
-
-        # ensure the prolog lines are kept
-        prolog_lines = csvh.filter_prolog(self._prolog_file, 1, 0)
-        self.assertEqual(prolog_lines, self.PROLOG_LINES)
-
-        # ensure the prolog was skipped
-        prolog_text = self._prolog_file.read()
-        test_text = self._test_file.read()
-        self.assertEqual(prolog_text, test_text)
-
-    def test_filter_prolog_skip(self):
-        """Test `filter_prolog(skip_prolog=1)`."""
-
-        # ensure the prolog lines are skipped
-        prolog_lines = csvh.filter_prolog(self._prolog_file, 0, 1)
-        self.assertEqual(prolog_lines, [])
+    @classmethod
+    def setUpClass(cls):
+        """Read test-files once. `tess_01.csv` has the prolog, `tess_00.csv` has no prolog, otherwise identical."""
+        cls._prolog_text = pathlib.Path("data/tess_01.csv").read_text(encoding="utf-8")
+        cls._test_text = pathlib.Path("data/tess_00.csv").read_text(encoding="utf-8")
 
-        # ensure the prolog was skipped
-        prolog_text = self._prolog_file.read()
-        test_text = self._test_file.read()
-        self.assertEqual(prolog_text, test_text)
-
-    # keep overrides skip
-    def test_filter_prolog_both(self):
-        """Test `filter_prolog(keep_prolog=1, skip_prolog=1)`.
+    def test_filter_prolog(self):
+        """Test `filter_prolog()` keeping, skipping, and both.
         As implemented, `keep_prolog` overrides `skip_prolog`.
         """
+        cases = [
+            (1, 0, self.PROLOG_LINES),
+            (0, 1, []),
+            (1, 1, self.PROLOG_LINES),  # keep overrides skip
+        ]
+        for keep_prolog, skip_prolog, test_lines in cases:
+            with self.subTest(keep_prolog=keep_prolog, skip_prolog=skip_prolog):
+                prolog_file = io.StringIO(self._prolog_text)
 
-        # ensure the prolog lines are kept
-        prolog_lines = csvh.filter_prolog(self._prolog_file, 1, 1)
-        self.assertEqual(prolog_lines, self.PROLOG_LINES)
+                # ensure the prolog lines are kept or skipped
+                prolog_lines = csvh.filter_prolog(prolog_file, keep_prolog, skip_prolog)
+                self.assertEqual(prolog_lines, test_lines)
 
-        # ensure the prolog was skipped
-        prolog_text = self._prolog_file.read()
-        test_text = self._test_file.read()
-        self.assertEqual(prolog_text, test_text)
+                # ensure the prolog was consumed
+                self.assertEqual(prolog_file.read(), self._test_text)
 
 
 class TestFilterCols(unittest.TestCase):
     """Test column-filtering functions."""
 
+    # input column-names, and one row with a value for each of them
+    INPUT_COLS = ("a", "b", "c", "d")
+    INPUT_ROW = types.MappingProxyType({"a": "1", "b": "2", "c": "3", "d": "4"})
+
+    # columns to keep and skip, with names not in the input
+    BOGUS_CASES = [
+        ("keep", ["BOGUS!"], []),
+        ("skip", [], ["BOGUS!"]),
+        ("keep some", ["b", "BOGUS!"], []),
+        ("skip some", [], ["b", "BOGUS!"]),
+    ]
+
     def test_read_cols(self):
         """Test `read_cols()`."""
-        input_cols = ["a", "b", "c", "d"]
-        self.assertEqual(csvh.read_cols(input_cols, [], []), input_cols)
+        input_cols = self.INPUT_COLS
+        self.assertEqual(csvh.read_cols(input_cols, [], []), list(input_cols))
         self.assertEqual(csvh.read_cols(input_cols, ["a", "c"], []), ["a", "c"])
         self.assertEqual(csvh.read_cols(input_cols, [], ["a", "c"]), ["b", "d"])
         self.assertEqual(csvh.read_cols(input_cols, ["a", "c"], ["c"]), ["a"])
-        with self.assertRaises(KeyError):
-            _ = csvh.read_cols(input_cols, ["BOGUS!"], [])
-        with self.assertRaises(KeyError):
-            _ = csvh.read_cols(input_cols, [], ["BOGUS!"])
+        for label, keep_cols, skip_cols in self.BOGUS_CASES:
+            with self.subTest(label=label), self.assertRaises(KeyError):
+                _ = csvh.read_cols(input_cols, keep_cols, skip_cols)
 
     def test_filter_cols(self):
         """Test `filter_cols()`."""
-        input_row = {"a": "1", "b": "2", "c": "3", "d": "4"}
+        input_row = self.INPUT_ROW
         self.assertEqual(csvh.filter_cols({}, []), {})
         self.assertEqual(csvh.filter_cols(input_row, []), input_row)
         self.assertEqual(csvh.filter_cols(input_row, ["b", "d"]), {"b": "2", "d": "4"})
-        with self.assertRaises(KeyError):
-            _ = csvh.filter_cols(input_row, ["BOGUS!"])
+        for label, keep_cols, _skip_cols in self.BOGUS_CASES:
+            if keep_cols:
+                with self.subTest(label=label), self.assertRaises(KeyError):
+                    _ = csvh.filter_cols(input_row, keep_cols)
+
+    def test_project_cols(self):
+        """Test `project_cols()`."""
+        input_row = tuple(self.INPUT_ROW.values())
+        self.assertEqual(csvh.project_cols([])(input_row), ())
+        self.assertEqual(csvh.project_cols([2])(input_row), ("3",))
+        self.assertEqual(csvh.project_cols([3, 1])(input_row), ("4", "2"))
+        with self.assertRaises(IndexError):
+            _ = csvh.project_cols([4])(input_row)
+
+    def test_index_cols(self):
+        """Test `index_cols()`."""
+        self.assertEqual(csvh.index_cols([]), {})
+        self.assertEqual(csvh.index_cols(["a", "b", "c"]), {"a": 0, "b": 1, "c": 2})
+        self.assertEqual(csvh.index_cols(["a", "b", "a"]), {"a": 2, "b": 1})  # last index, like csv.DictReader
+
+    def test_read_col_indices(self):
+        """Test `read_col_indices()`."""
+        input_cols = self.INPUT_COLS
+        self.assertEqual(csvh.read_col_indices(input_cols, []), [])
+        self.assertEqual(csvh.read_col_indices(input_cols, input_cols), [0, 1, 2, 3])
+        self.assertEqual(csvh.read_col_indices(input_cols, ["b", "d"]), [1, 3])
+        self.assertEqual(csvh.read_col_indices(["a", "b", "a"], ["a", "a"]), [0, 2])  # repeated names by position
 
 
 class TestFilterRows(unittest.TestCase):
     """Test row-filtering functions."""
 
+    # row-filters as parsed by `read_row_filters()`, allowed values for columns "a" and "b"
+    ROW_FILTERS = types.MappingProxyType({"a": frozenset(["a1", "a2"]), "b": frozenset(["b2", "b4"])})
+
     def test_read_cols(self):
         """Test `read_row_filters()`."""
         row_args = [["a", "a1", "a2"], ["b", "b2", "b4"]]
-        row_filters = {"a": ["a1", "a2"], "b": ["b2", "b4"]}
-        self.assertEqual(csvh.read_row_filters(row_args), row_filters)
+        self.assertEqual(csvh.read_row_filters(row_args), self.ROW_FILTERS)
+
+    # rows, and whether they match one or all the filters in `ROW_FILTERS`
+    MATCH_CASES = [
+        ({"a": "a1", "b": "b1"}, "one"),
+        ({"a": "a2", "b": "b2"}, "both"),
+        ({"a": "a3", "b": "b3"}, "none"),
+        ({"a": "a4", "b": "b4"}, "one"),
+    ]
+
+    # rows missing keys in `ROW_FILTERS`
+    MISSING_CASES = [{}, {"a": "a0"}]
 
     def test_keep_row(self):
         """Test `keep_row()`."""
-        row_filters = {"a": ["a1", "a2"], "b": ["b2", "b4"]}
 
         # test all filters are satisfied
-        self.assertEqual(csvh.keep_row({"a": "a1", "b": "b1"}, row_filters), False)  # one match
-        self.assertEqual(csvh.keep_row({"a": "a2", "b": "b2"}, row_filters), True)  # both match
-        self.assertEqual(csvh.keep_row({"a": "a3", "b": "b3"}, row_filters), False)  # no match
-        self.assertEqual(csvh.keep_row({"a": "a4", "b": "b4"}, row_filters), False)  # one match
+        for row, match in self.MATCH_CASES:
+            with self.subTest(row=row):
+                self.assertEqual(csvh.keep_row(row, self.ROW_FILTERS), match == "both")
 
-        # test missing key in filters
+        # test missing key in filters, filters stop at the first one that fails, like `filter_rows()`
         with self.assertRaises(KeyError):
-            _ = csvh.keep_row({}, row_filters)
-        with self.assertRaises(KeyError):
-            _ = csvh.keep_row({"a": "a0"}, row_filters)
+            _ = csvh.keep_row({}, self.ROW_FILTERS)
+        self.assertEqual(csvh.keep_row({"a": "a0"}, self.ROW_FILTERS), False)
+        self.assertEqual(list(csvh.filter_rows([{"a": "a0"}], self.ROW_FILTERS, {})), [])
 
     def test_skip_row(self):
         """Test `skip_row()`."""
-        row_filters = {"a": ["a1", "a2"], "b": ["b2", "b4"]}
 
-        # test all filters are satisfied
-        self.assertEqual(csvh.skip_row({"a": "a1", "b": "b1"}, row_filters), False)  # one match
-        self.assertEqual(csvh.skip_row({"a": "a2", "b": "b2"}, row_filters), False)  # both match
-        self.assertEqual(csvh.skip_row({"a": "a3", "b": "b3"}, row_filters), True)  # no match
-        self.assertEqual(csvh.skip_row({"a": "a4", "b": "b4"}, row_filters), False)  # one match
+        # test no filter is satisfied
+        for row, match in self.MATCH_CASES:
+            with self.subTest(row=row):
+                self.assertEqual(csvh.skip_row(row, self.ROW_FILTERS), match == "none")
 
         # test missing key in filters
-        with self.assertRaises(KeyError):
-            _ = csvh.skip_row({}, row_filters)
-        with self.assertRaises(KeyError):
-            _ = csvh.skip_row({"a": "a0"}, row_filters)
-
-    def test_filter_rows(self):
-        """Test `filter_rows()`."""
-
-        input_rows = [
+        for row in self.MISSING_CASES:
+            with self.subTest(row=row), self.assertRaises(KeyError):
+                _ = csvh.skip_row(row, self.ROW_FILTERS)
+
+    def test_compile_row_filter(self):
+        """Test `compile_row_filter()`."""
+        row_filter = csvh.compile_row_filter({}, {})
+        self.assertEqual(row_filter({}), True)
+
+        # filters by column-name
+        row_filter = csvh.compile_row_filter({"a": frozenset(["a1", "a2"])}, {"b": frozenset(["b2", "b4"])})
+        self.assertEqual(row_filter({"a": "a1", "b": "b1"}), True)
+        self.assertEqual(row_filter({"a": "a2", "b": "b2"}), False)
+        self.assertEqual(row_filter({"a": "a3", "b": "b3"}), False)
+
+        # filters by column-index, names that are not identifiers
+        row_filter = csvh.compile_row_filter({1: frozenset(["x"])}, {0: frozenset(["y"])})
+        self.assertEqual(row_filter(["z", "x"]), True)
+        self.assertEqual(row_filter(["y", "x"]), False)
+        row_filter = csvh.compile_row_filter({"a'\n)": frozenset(["x"])}, {})
+        self.assertEqual(row_filter({"a'\n)": "x"}), True)
+
+    # input rows by column-name, one per value of "a" and "b" in `ROW_FILTERS`
+    INPUT_ROWS = tuple(
+        types.MappingProxyType(row)
+        for row in [
             {"a": "a1", "b": "b1"},
             {"a": "a2", "b": "b2"},
             {"a": "a3", "b": "b3"},
             {"a": "a4", "b": "b4"},
         ]
+    )
 
-        test_rows = list(csvh.filter_rows(input_rows, {}, {}))
-        self.assertEqual(test_rows, input_rows)
-
-        keep_rows = {"a": ["a1", "a2"]}
-        skip_rows = {"b": ["b2", "b4"]}
-        test_rows = list(csvh.filter_rows(input_rows, keep_rows, skip_rows))
-        self.assertEqual(test_rows, [{"a": "a1", "b": "b1"}])
+    def test_filter_rows(self):
+        """Test `filter_rows()`."""
+        test_rows = []
+
+        test_rows.extend(csvh.filter_rows(self.INPUT_ROWS, {}, {}))
+        self.assertListEqual(test_rows, list(self.INPUT_ROWS))
+
+        keep_rows = {"a": frozenset(["a1", "a2"])}
+        skip_rows = {"b": frozenset(["b2", "b4"])}
+        test_rows.clear()
+        test_rows.extend(csvh.filter_rows(self.INPUT_ROWS, keep_rows, skip_rows))
+        self.assertListEqual(test_rows, [self.INPUT_ROWS[0]])
+
+    def test_read_row_indices(self):
+        """Test `read_row_indices()`."""
+        input_cols = ("a", "c", "b")
+        self.assertEqual(csvh.read_row_indices(input_cols, {}), {})
+        self.assertEqual(csvh.read_row_indices(input_cols, self.ROW_FILTERS), {0: {"a1", "a2"}, 2: {"b2", "b4"}})
+        with self.assertRaises(KeyError):
+            _ = csvh.read_row_indices(input_cols, {"BOGUS!": ["a1"]})
+
+
+class TestProcess(unittest.TestCase):
+    """Test csv-processing functions."""
+
+    def test_copy_prolog(self):
+        """Test `copy_prolog()`."""
+        input_text = "prolog 1\nprolog 2\na,b\n1,2\n"
+        prolog_text = "prolog 1\nprolog 2\n"
+        for keep_prolog, skip_prolog, output_text in [(2, 0, prolog_text), (0, 2, ""), (1, 2, prolog_text)]:
+            with self.subTest(keep_prolog=keep_prolog, skip_prolog=skip_prolog):
+                input_file = io.StringIO(input_text)
+                output_file = io.StringIO()
+                csvh.copy_prolog(input_file, output_file, keep_prolog, skip_prolog)
+                self.assertEqual(output_file.getvalue(), output_text)
+                self.assertEqual(input_file.read(), "a,b\n1,2\n")
+
+    def test_write_rows(self):
+        """Test `write_rows()`, quoted and unquoted dialects write the same as `csv.writer`."""
+        unquoted = csvh.read_dialect(csv.excel(), quoting=csv.QUOTE_NONE)
+        escaped = csvh.read_dialect(csv.excel(), quoting=csv.QUOTE_NONE, escapechar="\\")
+        input_rows = [["a1", "b1"], ("a2", "b2"), [], ["", ""]]
+        for dialect in [csv.excel, unquoted, escaped]:
+            with self.subTest(dialect=dialect):
+                output_file = io.StringIO()
+                test_file = io.StringIO()
+                csvh.write_rows(output_file, dialect, input_rows)
+                csv.writer(test_file, dialect=dialect).writerows(input_rows)
+                self.assertEqual(output_file.getvalue(), test_file.getvalue())
+
+        # values that need escaping fail like `csv.writer`
+        for bogus_rows in [[["a,1"]], [["a\n1"]], [['a"1']], [[""]], [("",)]]:
+            with self.subTest(bogus_rows=bogus_rows):
+                with self.assertRaises(csv.Error):
+                    csvh.write_rows(io.StringIO(), unquoted, bogus_rows)
+
+    def test_fit_rows(self):
+        """Test `fit_rows()`."""
+        input_rows = [["a1", "b1", "c1"], [], ["a2", "b2"], ["a3"], ["a4", "b4", "c4", "d4"], []]
+        test_rows = [["a1", "b1", "c1"], ["a2", "b2", ""], ["a3", "", ""], ["a4", "b4", "c4"]]
+        self.assertEqual(list(csvh.fit_rows(input_rows, 3)), test_rows)
+
+    def test_process_rows(self):
+        """Test `process_rows()`."""
+        input_rows = [["a1", "b1", "c1"], ["a2", "b2", "c2"], ["a3", "b3", "c3"]]
+
+        # no filter
+        output_file = io.StringIO()
+        csvh.process_rows(input_rows, output_file, csv.excel, 3, [0, 1, 2], {}, {})
+        self.assertEqual(output_file.getvalue(), "a1,b1,c1\r\na2,b2,c2\r\na3,b3,c3\r\n")
+
+        # filter columns and rows
+        output_file = io.StringIO()
+        keep_rows = {0: frozenset(["a1", "a2"])}
+        skip_rows = {1: frozenset(["b2"])}
+        csvh.process_rows(input_rows, output_file, csv.excel, 3, [2, 0], keep_rows, skip_rows)
+        self.assertEqual(output_file.getvalue(), "c1,a1\r\n")
+
+        # blank records and short rows, like the end of a file and a truncated line
+        ragged_rows = [["a1", "b1", "c1"], ["a2", "b2"], []]
+        for keep_idx, keep_rows, output_text in [
+            ([0, 1, 2], {}, "a1,b1,c1\r\na2,b2,\r\n"),
+            ([2, 0], {}, "c1,a1\r\n,a2\r\n"),
+            ([0, 1, 2], {2: frozenset([""])}, "a2,b2,\r\n"),
+        ]:
+            with self.subTest(keep_idx=keep_idx, keep_rows=keep_rows):
+                output_file = io.StringIO()
+                csvh.process_rows(ragged_rows, output_file, csv.excel_tab, 3, keep_idx, keep_rows, {})
+                self.assertEqual(output_file.getvalue(), output_text.replace(",", "\t"))
+
+    def test_process_csv_blank_line(self):
+        """Test `process_csv()` on a file ending in a blank line, with a short row."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, "input.csv")
+            output_path = os.path.join(temp_dir, "output.csv")
+            with open(input_path, "wt", newline="") as input_file:
+                input_file.write("a,b,c\r\n1,2,3\r\n4,5\r\n\r\n")
+            with csvh.open_input(input_path) as input_file, csvh.open_output(output_path) as output_file:
+                csvh.process_csv(
+                    input_file, output_file, csv.excel(), csv.excel(), 0, 0, ["a", "c"], ["b"],
+                    {"a": frozenset(["1", "4"])}, {},
+                )
+            with open(output_path, "rt", newline="") as output_file:
+                self.assertEqual(output_file.read(), "a,c\r\n1,3\r\n4,\r\n")
+
+    def test_can_process_parallel(self):
+        """Test `can_process_parallel()`."""
+        unquoted = csvh.read_dialect(csv.excel(), quoting=csv.QUOTE_NONE)
+        self.assertEqual(csvh.can_process_parallel(io.StringIO(), csv.excel), False)
+        self.assertEqual(csvh.can_process_parallel(io.StringIO(), unquoted), True)
+        with tempfile.TemporaryFile("w+t") as input_file:
+            self.assertEqual(csvh.can_process_parallel(input_file, unquoted), False)  # too small
+
+    def test_process_rows_parallel(self):
+        """Test `process_rows_parallel()` writes the same as `process_rows()`, in order."""
+        unquoted = csvh.read_dialect(csv.excel(), quoting=csv.QUOTE_NONE)
+        input_text = "".join(f"{i},{i % 3},{i % 5}\r\n" for i in range(1000))
+        process_args = (3, [2, 0], {1: frozenset(["1", "2"])}, {2: frozenset(["0"])})
+
+        test_file = io.StringIO()
+        csvh.process_rows(csv.reader(io.StringIO(input_text), unquoted), test_file, unquoted, *process_args)
+        output_file = io.StringIO()
+        with mock.patch.object(csvh, "PARALLEL_BATCH_ROWS", 64):
+            csvh.process_rows_parallel(io.StringIO(input_text), output_file, unquoted, unquoted, 2, *process_args)
+        self.assertEqual(output_file.getvalue(), test_file.getvalue())
+
+    def test_process_csv(self):
+        """Test `process_csv()` end-to-end with the arguments from `parse_args()`."""
+        num_rows = 1000
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_path = os.path.join(temp_dir, "input.csv")
+            output_path = os.path.join(temp_dir, "output.csv")
+            with open(input_path, "wt", newline="") as input_file:
+                csv_writer = csv.writer(input_file)
+                csv_writer.writerow(["a", "b", "c"])
+                csv_writer.writerows([str(i), str(i % 3), str(i % 5)] for i in range(num_rows))
+
+            # all arguments omitted, except filter rows
+            args = csvh.parse_args([input_path, output_path, "--keep-rows", "b", "1", "--skip-rows", "c", "0"])
+            with args.input_file, args.output_file:
+                csvh.process_csv(
+                    args.input_file, args.output_file, args.input_dialect, args.output_dialect,
+                    args.keep_prolog, args.skip_prolog, args.keep_cols, args.skip_cols,
+                    csvh.read_row_filters(args.keep_rows), csvh.read_row_filters(args.skip_rows),
+                )
+            with open(output_path, "rt", newline="") as output_file:
+                output_rows = list(csv.reader(output_file))
+            test_rows = [[str(i), str(i % 3), str(i % 5)] for i in range(num_rows) if i % 3 == 1 and i % 5 != 0]
+            self.assertEqual(output_rows, [["a", "b", "c"]] + test_rows)
+
+            # repeated column-names, each keeps its own value
+            with open(input_path, "wt", newline="") as input_file:
+                input_file.write("a,b,a\r\n1,2,3\r\n")
+            args = csvh.parse_args([input_path, output_path, "--skip-cols", "b"])
+            with args.input_file, args.output_file:
+                csvh.process_csv(
+                    args.input_file, args.output_file, args.input_dialect, args.output_dialect,
+                    args.keep_prolog, args.skip_prolog, args.keep_cols, args.skip_cols, {}, {},
+                )
+            with open(output_path, "rt", newline="") as output_file:
+                self.assertEqual(output_file.read(), "a,a\r\n1,3\r\n")
 
 
 class TestArg(unittest.TestCase):
-    def setUp(self):
-        self._arg_parser = argparse.ArgumentParser()
-        self._arg_parser.add_argument("dialect", type=csvh.dialect_arg)
+    """Test command-line argument functions."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the parser for `test_dialect_arg_parser()` once."""
+        cls._arg_parser = argparse.ArgumentParser()
+        cls._arg_parser.add_argument("dialect", type=csvh.dialect_arg)
 
     def test_dialect_arg(self):
         """Test `dialect_arg()`."""
@@ -200,3 +423,53 @@ class TestArg(unittest.TestCase):
         for name in ["", "BOGUS"]:
             with self.assertRaises(ValueError):
                 _ = csvh.dialect_arg(name)
+
+    def test_dialect_arg_parser(self):
+        """Test `dialect_arg()` as an `argparse` type, invalid names are reported as usage errors."""
+        args = self._arg_parser.parse_args(["unix"])
+        self.assertIsInstance(args.dialect, csv.unix_dialect)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            _ = self._arg_parser.parse_args(["BOGUS"])
+
+    def test_char_arg(self):
+        """Test `char_arg()`, and the one-character Dialect options as usage errors."""
+        self.assertEqual(csvh.char_arg(";"), ";")
+        for value in ["", "ab"]:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                _ = csvh.char_arg(value)
+        for option, value in [("--input-quotechar", ""), ("--input-escapechar", ""), ("--output-delimiter", "ab")]:
+            with self.subTest(option=option, value=value):
+                with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                    _ = csvh.parse_args(["-", "-", option, value])
+
+    def test_quoting_arg(self):
+        """Test the quoting options only accept the csv.QUOTE_* values."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "test.csv")
+            with open(path, "wt", newline="") as input_file:
+                input_file.write("a,b\r\n")
+            args = csvh.parse_args([path, os.path.join(temp_dir, "output.csv"), "--input-quoting", str(csv.QUOTE_NONE)])
+            with args.input_file, args.output_file:
+                self.assertEqual(args.input_quoting, csv.QUOTE_NONE)
+        for option in ["--input-quoting", "--output-quoting"]:
+            with self.subTest(option=option):
+                with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                    _ = csvh.parse_args(["-", "-", option, "7"])
+
+    def test_open_files(self):
+        """Test `open_output()` and `open_input()`."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "test.csv")
+            with csvh.open_output(path, "utf-8") as output_file:
+                output_file.write("a,b\r\n\u00e9,2\r\n")
+            with csvh.open_input(path, "utf-8") as input_file:
+                self.assertEqual(input_file.read(), "a,b\r\n\u00e9,2\r\n")  # no newline translation
+            with self.assertRaises(FileNotFoundError):
+                _ = csvh.open_input(os.path.join(temp_dir, "BOGUS.csv"))
+
+    def test_log_level(self):
+        """Test `log_level()`."""
+        self.assertEqual(csvh.log_level(0), logging.WARNING)
+        self.assertEqual(csvh.log_level(1), logging.INFO)
+        self.assertEqual(csvh.log_level(2), logging.DEBUG)
+        self.assertEqual(csvh.log_level(3), logging.DEBUG)